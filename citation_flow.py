@@ -5,12 +5,17 @@ Two-step citation flow:
 """
 
 import argparse
+import asyncio
 import json
 import math
 import re
+import sqlite3
+import threading
 import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
 from scholarly import ProxyGenerator, scholarly
@@ -25,7 +30,7 @@ DEFAULT_MAP = str(DEFAULT_OUTPUT_DIR / "citations_map_from_xlsx.png")
 DEFAULT_UNMAPPED = str(DEFAULT_OUTPUT_DIR / "unmapped_cities.txt")
 DEFAULT_COLUMN_F_XLSX = "citations_data.xlsx"
 DEFAULT_COLUMN_F_OUTPUT = "aish_citation_world_map.png"
-DEFAULT_CITY_CACHE = str(DEFAULT_OUTPUT_DIR / "city_mapping_cache.json")
+DEFAULT_CITY_CACHE = str(DEFAULT_OUTPUT_DIR / "city_mapping_cache.sqlite")
 DEFAULT_COLUMN_F_SUMMARY = str(DEFAULT_OUTPUT_DIR / "citation_location_tree.txt")
 
 # Light-weight institution-to-city mappings to improve city inference.
@@ -54,6 +59,60 @@ INSTITUTION_CITY_MAPPINGS = {
     "GA Tech": "Atlanta, Georgia, USA",
 }
 
+# Approximate campus coordinates for the institutions above; exact-match
+# lookups resolve from here without a geocoder round trip
+INSTITUTION_COORDS = {
+    "UCLA": (34.0689, -118.4452),
+    "Loyola University Chicago": (41.9995, -87.6578),
+    "Washington State University": (46.7319, -117.1542),
+    "Harbin Institute of Technology": (45.7444, 126.6431),
+    "University of Wisconsin-Madison": (43.0766, -89.4125),
+    "Tsinghua University": (40.0000, 116.3264),
+    "Stanford University": (37.4275, -122.1697),
+    "New Mexico State University": (32.2806, -106.7519),
+    "WorldServe Education": (12.9716, 77.5946),
+    "COMSATS University": (33.6518, 73.1566),
+    "Macquarie University": (-33.7738, 151.1126),
+    "Lancaster University": (54.0104, -2.7877),
+    "University of Houston": (29.7199, -95.3422),
+    "University of Science and Technology of China": (31.8206, 117.2272),
+    "Beijing Jiaotong University": (39.9494, 116.3428),
+    "National Institute of Technology Hamirpur": (31.7087, 76.5273),
+    "VNR VJIET": (17.5393, 78.3866),
+    "SNS College of Technology": (11.0966, 77.0376),
+    "Intel Corporation": (37.3875, -121.9636),
+    "Georgia Tech": (33.7756, -84.3963),
+    "Georgia Institute of Technology": (33.7756, -84.3963),
+    "GA Tech": (33.7756, -84.3963),
+}
+
+# Lowercased mapping keys precomputed once; with pyahocorasick installed
+# every institution is matched in a single automaton pass instead of one
+# substring scan per mapping entry
+_LOWER_MAPPINGS = {k.lower(): v for k, v in INSTITUTION_CITY_MAPPINGS.items()}
+try:
+    import ahocorasick
+
+    _INSTITUTION_AUTOMATON = ahocorasick.Automaton()
+    for _institution, _city in _LOWER_MAPPINGS.items():
+        _INSTITUTION_AUTOMATON.add_word(_institution, _city)
+    _INSTITUTION_AUTOMATON.make_automaton()
+except ImportError:
+    _INSTITUTION_AUTOMATON = None
+
+
+def match_institution_city(text):
+    """Return the mapped city for the first known institution in text."""
+    lower = text.lower()
+    if _INSTITUTION_AUTOMATON is not None:
+        for _, city in _INSTITUTION_AUTOMATON.iter(lower):
+            return city
+        return None
+    for institution, city in _LOWER_MAPPINGS.items():
+        if institution in lower:
+            return city
+    return None
+
 
 def setup_scholarly():
     """Setup scholarly with proxy where possible to reduce rate limiting."""
@@ -139,64 +198,163 @@ def format_location_label(location):
     return None
 
 
-def looks_like_institution(value):
-    keywords = [
-        "university",
-        "institute",
-        "college",
-        "school",
-        "department",
-        "laboratory",
-        "centre",
-        "center",
-        "tech",
-        "corporation",
-        "inc",
-        "ltd",
-    ]
-    lower = value.lower()
-    return any(keyword in lower for keyword in keywords)
+_CACHE_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS geocache ("
+    "raw TEXT PRIMARY KEY, label TEXT, lat REAL, lon REAL, query TEXT)"
+)
+
+
+def _open_cache_db(cache_path):
+    """Open (creating if needed) the SQLite geocache at cache_path.
+
+    If cache_path points at a legacy JSON cache (e.g. an old --cache
+    argument), its entries are imported into the sibling .sqlite file and
+    that database is used instead of tracebacking on CREATE TABLE.
+    """
+    path = Path(cache_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute(_CACHE_SCHEMA)
+        return conn
+    except sqlite3.DatabaseError:
+        conn.close()
+
+    sqlite_path = path.with_suffix(".sqlite")
+    print(f"⚠️  {path} is not a SQLite cache; using {sqlite_path} instead "
+          "(legacy JSON caches are imported automatically)")
+    conn = sqlite3.connect(sqlite_path)
+    conn.execute(_CACHE_SCHEMA)
+    _migrate_legacy_json_cache(conn, sqlite_path)
+    return conn
+
+
+def _cache_rows(cache):
+    """Yield (raw, label, lat, lon, query) tuples for upserting.
+
+    Iterates a snapshot so a concurrent writer can't grow the dict while
+    executemany is draining the generator.
+    """
+    for raw, entry in list(cache.items()):
+        if raw == "_by_coord" or not isinstance(entry, dict):
+            continue
+        yield raw, entry.get("label"), entry.get("lat"), entry.get("lon"), entry.get("query")
+
+
+def _migrate_legacy_json_cache(conn, cache_path):
+    """One-time import of a pre-SQLite JSON cache file, if present."""
+    legacy = Path(cache_path).with_suffix(".json")
+    if not legacy.exists():
+        return
+    if conn.execute("SELECT COUNT(*) FROM geocache").fetchone()[0]:
+        return
+    try:
+        with open(legacy, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return
+    with conn:
+        conn.executemany("INSERT OR REPLACE INTO geocache VALUES (?, ?, ?, ?, ?)", _cache_rows(data))
+    print(f"📦 Migrated legacy JSON cache: {legacy}")
 
 
 def load_city_cache(cache_path):
+    """Load the geocache into a dict; the _by_coord index is rebuilt."""
+    conn = _open_cache_db(cache_path)
     try:
-        with open(cache_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {}
+        _migrate_legacy_json_cache(conn, cache_path)
+        cache = {}
+        by_coord = {}
+        for raw, label, lat, lon, query in conn.execute(
+            "SELECT raw, label, lat, lon, query FROM geocache"
+        ):
+            entry = {"label": label, "lat": lat, "lon": lon, "query": query}
+            cache[raw] = entry
+            if lat is not None and lon is not None:
+                by_coord.setdefault(coord_key(lat, lon), entry)
+        if by_coord:
+            cache["_by_coord"] = by_coord
+        return cache
+    finally:
+        conn.close()
 
 
 def save_city_cache(cache_path, cache):
-    Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
-    with open(cache_path, "w", encoding="utf-8") as f:
-        json.dump(cache, f, indent=2, ensure_ascii=False)
+    """Upsert all cache entries in one transaction.
+
+    Unlike the old full-JSON rewrite, unchanged rows are cheap upserts, so
+    flushing inside the geocode loops is no longer quadratic in the cache
+    size.
+    """
+    conn = _open_cache_db(cache_path)
+    try:
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO geocache VALUES (?, ?, ?, ?, ?)", _cache_rows(cache)
+            )
+    finally:
+        conn.close()
 
 
-def update_city_cache(raw_values, geolocator, cache_path):
+def coord_key(lat, lon):
+    """Cache key at ~100m precision so aliases of one place collapse."""
+    return f"{lat:.3f},{lon:.3f}"
+
+
+def update_city_cache(raw_values, cache_path):
     cache = load_city_cache(cache_path)
+    # Secondary index keyed by rounded coordinates; "UCLA" and
+    # "University of California Los Angeles" alias to one entry
+    by_coord = cache.setdefault("_by_coord", {})
     updated = False
+    to_geocode = []
 
     for raw in sorted(raw_values):
         if raw in cache:
             continue
 
-        query = INSTITUTION_CITY_MAPPINGS.get(raw, raw)
-        if looks_like_institution(raw):
-            query = INSTITUTION_CITY_MAPPINGS.get(raw, raw)
-
-        location = geocode_with_retries(geolocator, query)
-        if location:
-            label = format_location_label(location) or query
-            cache[raw] = {
-                "label": label,
-                "lat": location.latitude,
-                "lon": location.longitude,
-                "query": query,
+        # Known institutions resolve from the inline coordinate table,
+        # skipping the geocoder round trip and the throttle sleep
+        if raw in INSTITUTION_COORDS:
+            lat, lon = INSTITUTION_COORDS[raw]
+            entry = {
+                "label": INSTITUTION_CITY_MAPPINGS[raw],
+                "lat": lat,
+                "lon": lon,
+                "query": raw,
             }
-        else:
-            cache[raw] = {"label": raw, "lat": None, "lon": None, "query": query}
-        updated = True
-        time.sleep(0.2)
+            cache[raw] = entry
+            by_coord.setdefault(coord_key(lat, lon), entry)
+            updated = True
+            continue
+
+        to_geocode.append(raw)
+
+    if to_geocode:
+        # Resolve all misses in one concurrent, rate-limited batch rather
+        # than a serial round trip + 0.2s sleep per entry
+        queries = {raw: INSTITUTION_CITY_MAPPINGS.get(raw, raw) for raw in to_geocode}
+        locations = asyncio.run(_geocode_batch_async(set(queries.values())))
+
+        for raw in to_geocode:
+            query = queries[raw]
+            location = locations.get(query)
+            if location:
+                key = coord_key(location.latitude, location.longitude)
+                if key in by_coord:
+                    cache[raw] = by_coord[key]
+                else:
+                    entry = {
+                        "label": format_location_label(location) or query,
+                        "lat": location.latitude,
+                        "lon": location.longitude,
+                        "query": query,
+                    }
+                    cache[raw] = entry
+                    by_coord[key] = entry
+            else:
+                cache[raw] = {"label": raw, "lat": None, "lon": None, "query": query}
+            updated = True
 
     if updated:
         save_city_cache(cache_path, cache)
@@ -204,19 +362,22 @@ def update_city_cache(raw_values, geolocator, cache_path):
     return cache
 
 
-def infer_city_from_affiliation(affiliation, geolocator):
-    """Infer city string from an affiliation using mappings + geocoding."""
-    if not affiliation:
-        return None
+# Serializes city-cache mutation and the geocode batches across the
+# paper workers: one batch at a time keeps the shared dict consistent
+# and holds aggregate Nominatim traffic to a single limiter's 1 req/s
+_city_cache_lock = threading.Lock()
 
-    for institution, city in INSTITUTION_CITY_MAPPINGS.items():
-        if institution.lower() in affiliation.lower():
-            return city
+# Concurrent Nominatim requests for the batched async geocode path; the
+# AsyncRateLimiter below still enforces the 1 req/s usage policy
+GEOCODE_CONCURRENCY = 4
+
+# Folds cell-value separators to one delimiter so splitting is a plain
+# str.split instead of a regex pass per cell
+_SEP_TRANS = str.maketrans({";": "\n"})
 
-    location = geocode_with_retries(geolocator, affiliation)
-    if not location:
-        return None
 
+def _city_label_from_location(location):
+    """Build a 'City, Country' label from a Nominatim result."""
     address = location.raw.get("address", {})
     city = (
         address.get("city")
@@ -237,6 +398,85 @@ def infer_city_from_affiliation(affiliation, geolocator):
     return None
 
 
+async def _geocode_batch_async(queries):
+    """Resolve queries against Nominatim concurrently, rate-limited."""
+    from geopy.adapters import AioHTTPAdapter
+    from geopy.extra.rate_limiter import AsyncRateLimiter
+
+    results = {}
+    async with Nominatim(
+        user_agent="citation_flow_geocoder", timeout=10, adapter_factory=AioHTTPAdapter
+    ) as geolocator:
+        geocode = AsyncRateLimiter(geolocator.geocode, min_delay_seconds=1.0)
+        semaphore = asyncio.Semaphore(GEOCODE_CONCURRENCY)
+
+        async def resolve(query):
+            async with semaphore:
+                try:
+                    results[query] = await geocode(query)
+                except Exception as exc:
+                    print(f"   ⚠️  Geocode failed for '{query}': {exc}")
+                    results[query] = None
+
+        await asyncio.gather(*(resolve(query) for query in queries))
+
+    return results
+
+
+def infer_cities_from_affiliations(affiliations, city_cache=None, cache_path=DEFAULT_CITY_CACHE):
+    """Infer city labels for a batch of affiliations.
+
+    Mapping and cache hits are resolved synchronously; the remaining
+    affiliations go to Nominatim in one concurrent rate-limited batch
+    instead of a serial geocode + sleep per author.
+    """
+    cities = {}
+    to_geocode = []
+    cache_keys = {}
+
+    for affiliation in dict.fromkeys(a for a in affiliations if a):
+        key = cache_keys[affiliation] = affiliation.strip().lower()
+        if city_cache is not None and key in city_cache:
+            cities[affiliation] = city_cache[key].get("label")
+            continue
+
+        mapped = match_institution_city(affiliation)
+        if mapped:
+            cities[affiliation] = mapped
+            if city_cache is not None:
+                city_cache[key] = {"label": mapped, "lat": None, "lon": None, "query": affiliation}
+        else:
+            to_geocode.append(affiliation)
+
+    if to_geocode:
+        locations = asyncio.run(_geocode_batch_async(to_geocode))
+        for affiliation in to_geocode:
+            location = locations.get(affiliation)
+            label = _city_label_from_location(location) if location else None
+            cities[affiliation] = label
+            if city_cache is not None:
+                city_cache[cache_keys[affiliation]] = {
+                    "label": label,
+                    "lat": location.latitude if location else None,
+                    "lon": location.longitude if location else None,
+                    "query": affiliation,
+                }
+        if city_cache is not None:
+            save_city_cache(cache_path, city_cache)
+
+    return cities
+
+
+# Prolific authors cite several papers, so the same ID recurs across
+# publications; lru_cache is thread-safe under the worker pool
+_seen_author_ids = set()
+
+
+@lru_cache(maxsize=4096)
+def _get_author_profile(author_id):
+    return scholarly.search_author_id(author_id)
+
+
 def fetch_author_with_publications(author_id):
     print("\n📚 Fetching author profile...")
     author = retry_request(lambda: scholarly.search_author_id(author_id))
@@ -254,56 +494,120 @@ def select_top_publications(publications, max_papers):
     return ranked[:max_papers]
 
 
-def fetch_citations_for_publication(publication):
-    try:
-        return list(scholarly.citedby(publication))
-    except Exception as exc:
-        print(f"   ❌ Error fetching citations: {exc}")
-        return []
+# Producer/consumer settings for the per-publication citation pipeline
+CITATION_QUEUE_SIZE = 32
+CITATION_WORKERS = 8
+
+
+def _citation_entry(citation):
+    """Resolve one citing paper into (title, authors, affiliations)."""
+    cit_title = citation.get("bib", {}).get("title", "Unknown")
+    author_ids = citation.get("author_id", [])
+    author_names = citation.get("bib", {}).get("author", [])
+    if isinstance(author_names, str):
+        author_names = [name.strip() for name in author_names.split(",")]
+
+    authors = []
+    affiliations = []
+
+    for i, author_id in enumerate(author_ids):
+        author_name = author_names[i] if i < len(author_names) else "Unknown"
+        affiliation = None
+
+        if author_id:
+            try:
+                first_fetch = author_id not in _seen_author_ids
+                _seen_author_ids.add(author_id)
+                author_profile = _get_author_profile(author_id)
+                author_name = author_profile.get("name", author_name)
+                affiliation = author_profile.get("affiliation", None)
+                if first_fetch:
+                    # Throttle only actual Scholar round trips
+                    time.sleep(0.3)
+            except Exception as exc:
+                print(f"      ⚠️  Could not fetch profile for {author_name}: {exc}")
+
+        authors.append(author_name)
+        affiliations.append(affiliation)
+
+    return cit_title, authors, affiliations
+
 
+async def _collect_citation_entries(publication):
+    """Pipeline citedby pagination into concurrent per-citation workers.
 
-def build_citing_rows_for_publication(publication, geolocator):
+    A producer streams citations off the (sync) citedby generator into a
+    bounded queue; worker tasks resolve author profiles concurrently, so
+    processing overlaps pagination instead of waiting for the full list.
+    """
+    queue = asyncio.Queue(maxsize=CITATION_QUEUE_SIZE)
+    entries = []
+
+    async def produce():
+        try:
+            iterator = await asyncio.to_thread(scholarly.citedby, publication)
+            sentinel = object()
+            index = 0
+            while True:
+                citation = await asyncio.to_thread(next, iterator, sentinel)
+                if citation is sentinel:
+                    break
+                await queue.put((index, citation))
+                index += 1
+        except Exception as exc:
+            print(f"   ❌ Error fetching citations: {exc}")
+        finally:
+            for _ in range(CITATION_WORKERS):
+                await queue.put(None)
+
+    async def worker():
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            index, citation = item
+            entries.append((index, await asyncio.to_thread(_citation_entry, citation)))
+            if len(entries) % 25 == 0:
+                print(f"   ...processed {len(entries)} citations")
+
+    workers = [asyncio.create_task(worker()) for _ in range(CITATION_WORKERS)]
+    await asyncio.gather(produce(), *workers)
+
+    # Workers finish out of order; restore citation order
+    entries.sort(key=lambda item: item[0])
+    return [entry for _, entry in entries]
+
+
+def build_citing_rows_for_publication(publication, city_cache=None):
     pub_title = publication.get("bib", {}).get("title", "Unknown Title")
     num_citations = publication.get("num_citations", 0)
     print(f"\n📄 {pub_title}")
     print(f"   Citations: {num_citations}")
 
     if num_citations == 0:
-        return []
+        return [], 0
+
+    pending = asyncio.run(_collect_citation_entries(publication))
+    print(f"   ✅ Retrieved {len(pending)} citing papers")
 
-    citations = fetch_citations_for_publication(publication)
-    print(f"   ✅ Retrieved {len(citations)} citing papers")
+    # Second pass: resolve every affiliation for this paper in one
+    # concurrent, rate-limited Nominatim batch. The lock keeps the shared
+    # cache dict single-writer and stops parallel paper workers from
+    # stacking geocode batches past the Nominatim usage policy.
+    all_affiliations = [aff for _, _, affs in pending for aff in affs if aff]
+    with _city_cache_lock:
+        city_by_affiliation = infer_cities_from_affiliations(all_affiliations, city_cache)
 
     rows = []
-    for cit_idx, citation in enumerate(citations, 1):
-        cit_title = citation.get("bib", {}).get("title", "Unknown")
-        author_ids = citation.get("author_id", [])
-        author_names = citation.get("bib", {}).get("author", [])
-        if isinstance(author_names, str):
-            author_names = [name.strip() for name in author_names.split(",")]
-
-        authors = []
+    max_cities = 0
+    for cit_title, authors, affiliations in pending:
         cities = []
-
-        for i, author_id in enumerate(author_ids):
-            author_name = author_names[i] if i < len(author_names) else "Unknown"
-            affiliation = None
-
-            if author_id:
-                try:
-                    author_profile = scholarly.search_author_id(author_id)
-                    author_name = author_profile.get("name", author_name)
-                    affiliation = author_profile.get("affiliation", None)
-                    time.sleep(0.3)
-                except Exception as exc:
-                    print(f"      ⚠️  Could not fetch profile for {author_name}: {exc}")
-
-            authors.append(author_name)
-
-            inferred_city = infer_city_from_affiliation(affiliation, geolocator)
+        for affiliation in affiliations:
+            inferred_city = city_by_affiliation.get(affiliation) if affiliation else None
             if inferred_city and inferred_city not in cities:
                 cities.append(inferred_city)
 
+        max_cities = max(max_cities, len(cities))
         rows.append(
             {
                 "citing_paper": cit_title,
@@ -312,16 +616,14 @@ def build_citing_rows_for_publication(publication, geolocator):
             }
         )
 
-        if cit_idx % 25 == 0:
-            print(f"   ...processed {cit_idx}/{len(citations)} citations")
-
-    return rows
+    return rows, max_cities
 
 
 def generate_review_xlsx(author_id, max_papers, output_xlsx):
     try:
         from openpyxl import Workbook
-        from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
         from openpyxl.utils import get_column_letter
     except ImportError:
         print("⚠️  openpyxl not installed. Installing...")
@@ -329,7 +631,8 @@ def generate_review_xlsx(author_id, max_papers, output_xlsx):
 
         subprocess.check_call(["pip", "install", "openpyxl"])
         from openpyxl import Workbook
-        from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
         from openpyxl.utils import get_column_letter
 
     setup_scholarly()
@@ -337,60 +640,87 @@ def generate_review_xlsx(author_id, max_papers, output_xlsx):
     publications = author.get("publications", [])
     selected_pubs = select_top_publications(publications, max_papers)
 
-    geolocator = get_geocoder()
+    # Shared with map-column-f so both steps reuse one cache file
+    city_cache = load_city_cache(DEFAULT_CITY_CACHE)
+
+    # Write-only mode streams rows to disk instead of keeping every Cell
+    # object in memory; it also starts without a default sheet
+    wb = Workbook(write_only=True)
 
-    wb = Workbook()
-    # Remove default sheet
-    wb.remove(wb.active)
+    # Styles are built once per workbook and registered as named styles,
+    # so every cell references one shared style id instead of fresh
+    # Font/Fill/Border objects per sheet
+    thin_side = Side(style="thin")
+    thin_border = Border(left=thin_side, right=thin_side, top=thin_side, bottom=thin_side)
+
+    header_style = NamedStyle(name="header")
+    header_style.font = Font(bold=True, color="FFFFFF")
+    header_style.fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+    header_style.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+    header_style.border = thin_border
+    wb.add_named_style(header_style)
+
+    body_style = NamedStyle(name="body")
+    body_style.border = thin_border
+    wb.add_named_style(body_style)
 
     existing_titles = set()
     summary = []
 
-    for pub in selected_pubs:
+    # Fetch the selected papers in parallel — the Scholar IO per paper is
+    # independent, while geocoding and cache writes are serialized inside
+    # build_citing_rows_for_publication. XLSX assembly stays on the main
+    # thread since openpyxl is not reentrant.
+    with ThreadPoolExecutor(max_workers=min(4, max(len(selected_pubs), 1))) as executor:
+        results = list(
+            executor.map(
+                lambda pub: (pub, build_citing_rows_for_publication(pub, city_cache)),
+                selected_pubs,
+            )
+        )
+
+    for pub, (rows, max_city_cols) in results:
         pub_title = pub.get("bib", {}).get("title", "Unknown Title")
         sheet_title = sanitize_sheet_title(pub_title, existing_titles)
         existing_titles.add(sheet_title)
 
-        rows = build_citing_rows_for_publication(pub, geolocator)
         summary.append({"paper": pub_title, "citations": len(rows)})
 
         ws = wb.create_sheet(title=sheet_title)
 
-        max_city_cols = max((len(r["cities"]) for r in rows), default=0)
         headers = ["S.No", "Citing Paper", "Author Names"]
         headers.extend([f"City {i}" for i in range(1, max_city_cols + 1)])
 
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        thin_border = Border(
-            left=Side(style="thin"),
-            right=Side(style="thin"),
-            top=Side(style="thin"),
-            bottom=Side(style="thin"),
-        )
-
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-            cell.border = thin_border
-
-        for row_idx, row in enumerate(rows, 2):
-            ws.cell(row=row_idx, column=1, value=row_idx - 1).border = thin_border
-            ws.cell(row=row_idx, column=2, value=row["citing_paper"]).border = thin_border
-            ws.cell(row=row_idx, column=3, value="; ".join(row["authors"])).border = thin_border
-
-            for city_idx, city in enumerate(row["cities"], 1):
-                ws.cell(row=row_idx, column=3 + city_idx, value=city).border = thin_border
-
-        # Adjust column widths
+        # Widths and the frozen header row must be configured before any
+        # row is appended; write-only sheets cannot be revisited
         column_widths = [8, 70, 45] + [30] * max_city_cols
         for i, width in enumerate(column_widths, 1):
             ws.column_dimensions[get_column_letter(i)].width = width
-
         ws.freeze_panes = "A2"
 
+        header_cells = []
+        for header in headers:
+            cell = WriteOnlyCell(ws, value=header)
+            cell.style = "header"
+            header_cells.append(cell)
+        ws.append(header_cells)
+
+        def bordered(value, ws=ws):
+            cell = WriteOnlyCell(ws, value=value)
+            cell.style = "body"
+            return cell
+
+        for row_idx, row in enumerate(rows, 1):
+            cells = [
+                bordered(row_idx),
+                bordered(row["citing_paper"]),
+                bordered("; ".join(row["authors"])),
+            ]
+            cells.extend(bordered(city) for city in row["cities"])
+            ws.append(cells)
+
+    save_city_cache(DEFAULT_CITY_CACHE, city_cache)
+
     Path(output_xlsx).parent.mkdir(parents=True, exist_ok=True)
     wb.save(output_xlsx)
     print(f"\n✅ Review XLSX saved: {output_xlsx}")
@@ -414,13 +744,14 @@ def generate_review_xlsx(author_id, max_papers, output_xlsx):
 def collect_cities_from_xlsx(xlsx_path):
     from openpyxl import load_workbook
 
-    wb = load_workbook(xlsx_path)
+    # read_only streams rows instead of materializing every cell object;
+    # max_row is unreliable in this mode, but empty sheets simply yield
+    # no rows from iter_rows
+    wb = load_workbook(xlsx_path, read_only=True, data_only=True)
     city_counts = defaultdict(int)
 
     for sheet_name in wb.sheetnames:
         ws = wb[sheet_name]
-        if ws.max_row < 2:
-            continue
 
         # Columns: 1 S.No, 2 Citing Paper, 3 Author Names, 4+ City columns
         for row in ws.iter_rows(min_row=2, values_only=True):
@@ -431,6 +762,8 @@ def collect_cities_from_xlsx(xlsx_path):
                     city = str(cell).strip()
                     city_counts[city] += 1
 
+    # Release the underlying zip handle held by the streaming parser
+    wb.close()
     return city_counts
 
 
@@ -440,15 +773,21 @@ def generate_map_from_xlsx(xlsx_path, output_path, unmapped_path):
         print("❌ No cities found in XLSX. Check your data.")
         return
 
-    geolocator = get_geocoder()
+    # One async Nominatim session geocodes every city over a single
+    # connection; AsyncRateLimiter keeps the 1 req/s cadence, so the old
+    # per-city time.sleep(0.2) is gone
+    locations = asyncio.run(_geocode_batch_async(list(city_counts)))
+
     latitudes = []
     longitudes = []
     labels = []
     sizes = []
     unmapped = []
 
-    for city, count in sorted(city_counts.items(), key=lambda x: x[1], reverse=True):
-        location = geocode_with_retries(geolocator, city)
+    # Dict order (xlsx read order) is already deterministic; sorting by
+    # count was only cosmetic and copied the whole dict
+    for city, count in city_counts.items():
+        location = locations.get(city)
         if not location:
             unmapped.append(city)
             continue
@@ -456,7 +795,6 @@ def generate_map_from_xlsx(xlsx_path, output_path, unmapped_path):
         longitudes.append(location.longitude)
         labels.append(f"{city} ({count})")
         sizes.append(6 + 3 * math.log(count + 1))
-        time.sleep(0.2)
 
     if not latitudes:
         print("❌ No cities could be geocoded. Map not generated.")
@@ -489,27 +827,28 @@ def generate_map_from_xlsx(xlsx_path, output_path, unmapped_path):
 def collect_cities_from_column(xlsx_path, column_index):
     from openpyxl import load_workbook
 
-    wb = load_workbook(xlsx_path)
+    wb = load_workbook(xlsx_path, read_only=True, data_only=True)
     city_counts = defaultdict(int)
 
     for sheet_name in wb.sheetnames:
         ws = wb[sheet_name]
-        if ws.max_row < 2:
-            continue
 
-        for row in ws.iter_rows(min_row=2, values_only=True):
-            if not row or len(row) < column_index:
-                continue
-            cell = row[column_index - 1]
+        # Bound iter_rows to the one column we read; the streaming parser
+        # then never materializes values for columns A-E
+        for row in ws.iter_rows(
+            min_row=2, min_col=column_index, max_col=column_index, values_only=True
+        ):
+            cell = row[0] if row else None
             if not cell:
                 continue
             raw = str(cell).strip()
             if not raw:
                 continue
-            values = [v.strip() for v in re.split(r"[;\n]", raw) if v.strip()]
+            values = [v for v in (s.strip() for s in raw.translate(_SEP_TRANS).split("\n")) if v]
             for value in values:
                 city_counts[value] += 1
 
+    wb.close()
     return city_counts
 
 
@@ -565,25 +904,29 @@ def generate_map_from_column_f(xlsx_path, output_path, unmapped_path, cache_path
         print("❌ No cities found in Column F. Check your data.")
         return
 
-    geolocator = get_geocoder()
-    cache = update_city_cache(city_counts.keys(), geolocator, cache_path)
+    cache = update_city_cache(city_counts.keys(), cache_path)
     tree = build_citation_city_tree(xlsx_path, cache)
 
-    latitudes = []
-    longitudes = []
-    labels = []
-    sizes = []
     unmapped = []
-    coords_by_label = {}
+    cache_dirty = False
+    # Aggregate by rounded coordinates rather than label so alias strings
+    # that resolve to the same point merge into one marker
+    coords_by_key = {}
+    labels_by_key = {}
     resolved_counts = defaultdict(int)
+    # Only the label fallback below still needs a synchronous geocoder;
+    # build it lazily so the common all-cached run skips it entirely
+    geolocator = None
 
-    for raw_city, count in sorted(city_counts.items(), key=lambda x: x[1], reverse=True):
+    for raw_city, count in city_counts.items():
         entry = cache.get(raw_city, {})
         label = entry.get("label", raw_city)
         lat = entry.get("lat")
         lon = entry.get("lon")
 
         if lat is None or lon is None:
+            if geolocator is None:
+                geolocator = get_geocoder()
             location = geocode_with_retries(geolocator, label)
             if location:
                 lat = location.latitude
@@ -594,23 +937,31 @@ def generate_map_from_column_f(xlsx_path, output_path, unmapped_path, cache_path
                     "lon": lon,
                     "query": entry.get("query", label),
                 }
-                save_city_cache(cache_path, cache)
+                cache_dirty = True
             else:
                 unmapped.append(raw_city)
                 continue
 
-        if label not in coords_by_label:
-            coords_by_label[label] = (lat, lon)
-        resolved_counts[label] += count
+        key = coord_key(lat, lon)
+        if key not in coords_by_key:
+            coords_by_key[key] = (lat, lon)
+            labels_by_key[key] = label
+        resolved_counts[key] += count
+
+    # Flush new entries once, after the loop — persisting per geocode
+    # rewrote every cached row for each miss
+    if cache_dirty:
+        save_city_cache(cache_path, cache)
 
     if not resolved_counts:
         print("❌ No cities could be geocoded. Map not generated.")
         return
 
-    labels = list(resolved_counts.keys())
-    sizes = [resolved_counts[label] for label in labels]
-    latitudes = [coords_by_label[label][0] for label in labels]
-    longitudes = [coords_by_label[label][1] for label in labels]
+    keys = list(resolved_counts.keys())
+    labels = [labels_by_key[key] for key in keys]
+    sizes = [resolved_counts[key] for key in keys]
+    latitudes = [coords_by_key[key][0] for key in keys]
+    longitudes = [coords_by_key[key][1] for key in keys]
     marker_sizes = [6 + 3 * math.log(size + 1) for size in sizes]
     marker_labels = [f"{label} ({size})" for label, size in zip(labels, sizes)]
 
@@ -658,7 +1009,7 @@ def main():
     column_parser.add_argument("--xlsx", default=DEFAULT_COLUMN_F_XLSX, help="Input XLSX path")
     column_parser.add_argument("--output", default=DEFAULT_COLUMN_F_OUTPUT, help="Output map image path")
     column_parser.add_argument("--unmapped", default=DEFAULT_UNMAPPED, help="Unmapped cities output")
-    column_parser.add_argument("--cache", default=DEFAULT_CITY_CACHE, help="City mapping cache JSON")
+    column_parser.add_argument("--cache", default=DEFAULT_CITY_CACHE, help="City mapping cache SQLite file")
     column_parser.add_argument("--summary", default=DEFAULT_COLUMN_F_SUMMARY, help="Citation location tree output")
 
     args = parser.parse_args()
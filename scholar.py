@@ -2,6 +2,15 @@ from scholarly import scholarly
 from geopy.geocoders import Nominatim
 import plotly.graph_objects as go
 import plotly.io
+from geopy.adapters import AioHTTPAdapter
+from geopy.extra.rate_limiter import AsyncRateLimiter
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import io
+import json
+import os
+import sys
+import sqlite3
 import ssl
 import certifi
 import time
@@ -11,96 +20,319 @@ import re
 # https://scholar.google.com/citations?user=FA9h3ngAAAAJ&hl=en
 AUTHOR_ID = 'FA9h3ngAAAAJ'
 
-# Common location mappings
+# Persistent geocode cache — affiliations rarely change, so repeat runs
+# (and repeat affiliations within a run) skip the Nominatim round trip
+GEOCODE_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'scholar_geocode.sqlite')
+
+# Scholar results cache — lets you iterate on the tree/map rendering
+# without re-fetching minutes of Google Scholar traffic every run
+SCHOLAR_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'scholar_results.sqlite')
+SCHOLAR_CACHE_TTL = 7 * 86400  # citations move slowly; a week is fresh enough
+
+_PUNCT_RE = re.compile(r'[^\w\s]')
+
+# Common location mappings, pre-geocoded as (address, lat, lon) so known
+# institutions never touch Nominatim
 LOCATION_MAPPINGS = {
-    'UCLA': 'Los Angeles, California, USA',
-    'Loyola University Chicago': 'Chicago, Illinois, USA',
-    'Washington State University': 'Pullman, Washington, USA',
-    'Harbin Institute of Technology': 'Harbin, China',
-    'University of Wisconsin-Madison': 'Madison, Wisconsin, USA',
-    'Tsinghua University': 'Beijing, China',
-    'Stanford University': 'Stanford, California, USA',
-    'New Mexico State University': 'Las Cruces, New Mexico, USA',
-    'WorldServe Education': 'Bangalore, India',
-    'COMSATS University': 'Islamabad, Pakistan',
-    'Macquarie University': 'Sydney, Australia',
-    'Lancaster University': 'Lancaster, UK',
-    'University of Houston': 'Houston, Texas, USA',
-    'University of Science and Technology of China': 'Hefei, China',
-    'Beijing Jiaotong University': 'Beijing, China',
-    'National Institute of Technology Hamirpur': 'Hamirpur, India',
-    'VNR VJIET': 'Hyderabad, India',
-    'SNS College of Technology': 'Coimbatore, India',
-    'Intel Corporation': 'Santa Clara, California, USA',
+    'UCLA': ('Los Angeles, California, USA', 34.0522, -118.2437),
+    'Loyola University Chicago': ('Chicago, Illinois, USA', 41.8781, -87.6298),
+    'Washington State University': ('Pullman, Washington, USA', 46.7298, -117.1817),
+    'Harbin Institute of Technology': ('Harbin, China', 45.8038, 126.5349),
+    'University of Wisconsin-Madison': ('Madison, Wisconsin, USA', 43.0731, -89.4012),
+    'Tsinghua University': ('Beijing, China', 39.9042, 116.4074),
+    'Stanford University': ('Stanford, California, USA', 37.4275, -122.1697),
+    'New Mexico State University': ('Las Cruces, New Mexico, USA', 32.3199, -106.7637),
+    'WorldServe Education': ('Bangalore, India', 12.9716, 77.5946),
+    'COMSATS University': ('Islamabad, Pakistan', 33.6844, 73.0479),
+    'Macquarie University': ('Sydney, Australia', -33.8688, 151.2093),
+    'Lancaster University': ('Lancaster, UK', 54.0465, -2.8007),
+    'University of Houston': ('Houston, Texas, USA', 29.7604, -95.3698),
+    'University of Science and Technology of China': ('Hefei, China', 31.8206, 117.2272),
+    'Beijing Jiaotong University': ('Beijing, China', 39.9042, 116.4074),
+    'National Institute of Technology Hamirpur': ('Hamirpur, India', 31.6862, 76.5213),
+    'VNR VJIET': ('Hyderabad, India', 17.3850, 78.4867),
+    'SNS College of Technology': ('Coimbatore, India', 11.0168, 76.9558),
+    'Intel Corporation': ('Santa Clara, California, USA', 37.3541, -121.9552),
 }
 
+# With pyahocorasick installed every affiliation is scanned once for all
+# mapped institutions; otherwise fall back to the per-key substring scan
+_LOWER_LOCATION_MAPPINGS = [(k.lower(), k, v) for k, v in LOCATION_MAPPINGS.items()]
+try:
+    import ahocorasick
+
+    _LOCATION_AUTOMATON = ahocorasick.Automaton()
+    for _lower, _institution, _mapped in _LOWER_LOCATION_MAPPINGS:
+        _LOCATION_AUTOMATON.add_word(_lower, (_institution, _mapped))
+    _LOCATION_AUTOMATON.make_automaton()
+except ImportError:
+    _LOCATION_AUTOMATON = None
+
+def match_mapped_location(text):
+    """Return (institution, (address, lat, lon)) for the first mapped institution in text"""
+    lower = text.lower()
+    if _LOCATION_AUTOMATON is not None:
+        for _, match in _LOCATION_AUTOMATON.iter(lower):
+            return match
+        return None
+    for lower_key, institution, mapped in _LOWER_LOCATION_MAPPINGS:
+        if lower_key in lower:
+            return institution, mapped
+    return None
+
+# Compiled once; clean_affiliation runs per author so the per-call
+# Python loop over prefixes and the throwaway regex compiles add up
+_PREFIX_RE = re.compile(
+    r'^(?:Assistant Professor|Associate Professor|Professor|PhD Student|Ph\.D\. Candidate'
+    r'|Research Assistant|Managing Director|Engineer|Doctor of Philosophy'
+    r'|Senior Design Engineer)\s*,?\s*(?:at\s+)?',
+    re.IGNORECASE,
+)
+_BRACKETS_RE = re.compile(r'\([^)]*\)|\[[^\]]*\]')
+_PHRASES_RE = re.compile(
+    r'Formerly HOD, Dean\(R&C\), Dean Acad|IEEE Fellow, AAIA Fellow, ACM Distinguished Member'
+)
+
 def clean_affiliation(affiliation):
     """Clean affiliation string to extract institution name"""
-    # Remove common prefixes
-    prefixes = ['Assistant Professor', 'Professor', 'PhD Student', 'Ph.D. Candidate', 
-                'Research Assistant', 'Managing Director', 'Engineer', 'Doctor of Philosophy',
-                'Associate Professor', 'Senior Design Engineer']
-    
-    for prefix in prefixes:
-        if affiliation.startswith(prefix):
-            affiliation = affiliation[len(prefix):].strip()
-            if affiliation.startswith(','):
-                affiliation = affiliation[1:].strip()
-            if affiliation.startswith('at'):
-                affiliation = affiliation[2:].strip()
-    
-    # Remove anything in brackets
-    affiliation = re.sub(r'\([^)]*\)', '', affiliation)
-    affiliation = re.sub(r'\[[^\]]*\]', '', affiliation)
-    
-    # Remove specific phrases
-    affiliation = affiliation.replace('Formerly HOD, Dean(R&C), Dean Acad', '')
-    affiliation = affiliation.replace('IEEE Fellow, AAIA Fellow, ACM Distinguished Member', '')
-    
+    # Fast path: most affiliations carry no prefix, brackets, or kill
+    # phrases, so three substitutions would all be no-ops
+    if ('(' not in affiliation and '[' not in affiliation
+            and 'Fellow' not in affiliation and 'Formerly' not in affiliation
+            and _PREFIX_RE.match(affiliation) is None):
+        return affiliation.strip()
+
+    affiliation = _PREFIX_RE.sub('', affiliation)
+    affiliation = _BRACKETS_RE.sub('', affiliation)
+    affiliation = _PHRASES_RE.sub('', affiliation)
     return affiliation.strip()
 
-def get_geocoder():
-    """Create and return a configured geocoder with SSL context"""
+async def _geocode_queries_async(queries, concurrency=2):
+    """Geocode queries over one shared aiohttp session at Nominatim cadence"""
+    results = {}
     ssl_context = ssl.create_default_context(cafile=certifi.where())
-    return Nominatim(user_agent="my_geocoder", ssl_context=ssl_context, timeout=10)
+    async with Nominatim(user_agent="my_geocoder", ssl_context=ssl_context,
+                         timeout=10, adapter_factory=AioHTTPAdapter) as geolocator:
+        limited = AsyncRateLimiter(geolocator.geocode, min_delay_seconds=1,
+                                   max_retries=3, error_wait_seconds=2.0)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def lookup(query):
+            async with semaphore:
+                try:
+                    results[query] = await limited(query)
+                except Exception as e:
+                    print(f"Geocoding failed for {query}: {e}")
+                    results[query] = None
+
+        await asyncio.gather(*(lookup(query) for query in queries))
+    return results
+
+def resolve_affiliations(affiliations):
+    """Resolve affiliations to {affiliation: (lat, lon, address)}.
+
+    Mapped institutions and cache hits never leave memory/disk; the rest
+    go to Nominatim in one concurrent rate-limited batch.
+    """
+    resolved = {}
+    to_geocode = {}
+    for affiliation in affiliations:
+        cleaned_aff = clean_affiliation(affiliation)
+        match = match_mapped_location(cleaned_aff)
+        if match:
+            institution, (address, lat, lon) = match
+            print(f"Using mapped location for {institution}: {address}")
+            resolved[affiliation] = (lat, lon, address)
+        else:
+            to_geocode[affiliation] = cleaned_aff
+
+    if not to_geocode:
+        return resolved
+
+    # Bucket by the lowered cleaned form so each canonical institution is
+    # geocoded once; the result fans out to every raw variant ("UCLA" vs
+    # "UCLA Dept. of CS" style duplicates)
+    queries = {}
+    members = {}
+    for affiliation, cleaned in to_geocode.items():
+        key = cleaned.lower()
+        queries.setdefault(key, cleaned)
+        members.setdefault(key, []).append(affiliation)
+
+    conn = _open_geocode_cache()
+    try:
+        pending = {}
+        for key, query in queries.items():
+            row = conn.execute(
+                'SELECT lat, lon, address FROM geocode WHERE query = ?',
+                (_normalize_query(query),),
+            ).fetchone()
+            if row:
+                for affiliation in members[key]:
+                    resolved[affiliation] = row
+            else:
+                pending[key] = query
+
+        if pending:
+            locations = asyncio.run(_geocode_queries_async(set(pending.values())))
+            with conn:
+                for key, query in pending.items():
+                    location_info = locations.get(query)
+                    if location_info:
+                        result = (location_info.latitude,
+                                  location_info.longitude,
+                                  location_info.address)
+                        conn.execute(
+                            'INSERT OR REPLACE INTO geocode VALUES (?, ?, ?, ?, ?)',
+                            (_normalize_query(query), location_info.latitude,
+                             location_info.longitude, location_info.address,
+                             int(time.time())),
+                        )
+                    else:
+                        result = (None, None, None)
+                    for affiliation in members[key]:
+                        resolved[affiliation] = result
+    finally:
+        conn.close()
+
+    return resolved
+
+def _normalize_query(location):
+    """Normalize a location query for cache lookups"""
+    return ' '.join(_PUNCT_RE.sub(' ', location.lower()).split())
+
+def _open_geocode_cache():
+    os.makedirs(os.path.dirname(GEOCODE_CACHE_PATH), exist_ok=True)
+    conn = sqlite3.connect(GEOCODE_CACHE_PATH)
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS geocode '
+        '(query TEXT PRIMARY KEY, lat REAL, lon REAL, address TEXT, ts INTEGER)'
+    )
+    return conn
+
+def _open_scholar_cache():
+    os.makedirs(os.path.dirname(SCHOLAR_CACHE_PATH), exist_ok=True)
+    conn = sqlite3.connect(SCHOLAR_CACHE_PATH)
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, payload TEXT, ts INTEGER)'
+    )
+    return conn
 
-def geocode_location(geolocator, location):
-    """Safely geocode a location with retries"""
-    max_retries = 3
-    for attempt in range(max_retries):
+def _scholar_cached(key, fetch):
+    """Return fetch(), cached on disk for SCHOLAR_CACHE_TTL seconds"""
+    conn = _open_scholar_cache()
+    try:
+        row = conn.execute('SELECT payload, ts FROM results WHERE key = ?', (key,)).fetchone()
+        if row and time.time() - row[1] < SCHOLAR_CACHE_TTL:
+            return json.loads(row[0])
+        result = fetch()
+        with conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO results VALUES (?, ?, ?)',
+                (key, json.dumps(result, default=str), int(time.time())),
+            )
+        return result
+    finally:
+        conn.close()
+
+def cached_author(author_id):
+    return _scholar_cached(f'author:{author_id}',
+                           lambda: scholarly.search_author_id(author_id))
+
+def cached_author_with_publications(author_id):
+    def fetch():
+        author = scholarly.search_author_id(author_id)
+        scholarly.fill(author, sections=['publications'])
+        return author
+    return _scholar_cached(f'author_pubs:{author_id}', fetch)
+
+def cached_citedby(publication):
+    key = publication.get('author_pub_id') or publication.get('bib', {}).get('title', '')
+    return _scholar_cached(f'citedby:{key}', lambda: list(scholarly.citedby(publication)))
+
+def fetch_authors_parallel(author_ids, max_workers=8):
+    """Fetch author profiles in parallel; failures are skipped"""
+    def fetch(a_id):
         try:
-            location_info = geolocator.geocode(location)
-            if location_info:
-                return location_info.latitude, location_info.longitude, location_info.address
-            time.sleep(1)  # Wait before retrying
+            return a_id, cached_author(a_id)
         except Exception as e:
-            print(f"Attempt {attempt + 1} failed for {location}: {e}")
-            time.sleep(2)  # Wait longer between retries
-    return None, None, None
+            print(f"Could not fetch author {a_id}: {e}")
+            return a_id, None
+
+    authors_by_id = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for a_id, author in executor.map(fetch, author_ids):
+            if author:
+                authors_by_id[a_id] = author
+    return authors_by_id
+
+def render_map(latitudes, longitudes, location_names, title, output_path):
+    """Render the citation map, preferring matplotlib/cartopy over Kaleido.
+
+    plotly's write_image spawns a headless Chromium via Kaleido — seconds
+    of cold start for a few dozen markers. When matplotlib + cartopy are
+    installed the map renders in-process; otherwise plotly remains the
+    fallback.
+    """
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        import cartopy.crs as ccrs
+    except ImportError:
+        fig = go.Figure(data=go.Scattergeo(
+            lon=longitudes,
+            lat=latitudes,
+            text=location_names,
+            mode='markers',
+            marker_color="blue"
+        ))
+        fig.update_geos(
+            visible=True,
+            scope="world",
+            showcountries=True,
+            countrycolor="Grey"
+        )
+        fig.update_layout(title=title, geo_scope='world')
+        fig.write_image(output_path, scale=2)
+        return
+
+    ax = plt.axes(projection=ccrs.PlateCarree())
+    ax.set_global()
+    ax.coastlines(color='grey')
+    ax.scatter(longitudes, latitudes, transform=ccrs.PlateCarree(),
+               color='blue', alpha=0.7, zorder=3)
+    ax.set_title(title, fontsize=9)
+    plt.savefig(output_path, dpi=150, bbox_inches='tight')
+    plt.close()
 
 def print_author_details(author):
     """
     Print author details in a readable format.
     """
-    print("\n" + "="*50)
-    print("AUTHOR DETAILS")
-    print("="*50)
-    print(f"Name: {author.get('name', 'N/A')}")
-    print(f"Affiliation: {author.get('affiliation', 'N/A')}")
-    print(f"Interests: {', '.join(author.get('interests', ['N/A']))}")
-    print(f"Citations: {author.get('citedby', 0):,}")
-    print(f"h-index: {author.get('hindex', 0)}")
-    print(f"i10-index: {author.get('i10index', 0)}")
-    
+    buf = io.StringIO()
+    buf.write("\n" + "="*50 + "\n")
+    buf.write("AUTHOR DETAILS\n")
+    buf.write("="*50 + "\n")
+    buf.write(f"Name: {author.get('name', 'N/A')}\n")
+    buf.write(f"Affiliation: {author.get('affiliation', 'N/A')}\n")
+    buf.write(f"Interests: {', '.join(author.get('interests', ['N/A']))}\n")
+    buf.write(f"Citations: {author.get('citedby', 0):,}\n")
+    buf.write(f"h-index: {author.get('hindex', 0)}\n")
+    buf.write(f"i10-index: {author.get('i10index', 0)}\n")
+
     if 'publications' in author:
-        print("\n" + "-"*50)
-        print("RECENT PUBLICATIONS")
-        print("-"*50)
+        buf.write("\n" + "-"*50 + "\n")
+        buf.write("RECENT PUBLICATIONS\n")
+        buf.write("-"*50 + "\n")
         for i, pub in enumerate(author['publications'][:5], 1):
-            print(f"\n{i}. {pub.get('bib', {}).get('title', 'N/A')}")
-            print(f"   Year: {pub.get('bib', {}).get('pub_year', 'N/A')}")
-            print(f"   Citations: {pub.get('num_citations', 0)}")
-            print(f"   Authors: {pub.get('bib', {}).get('author', 'N/A')}")
+            bib = pub.get('bib') or {}
+            buf.write(f"\n{i}. {bib.get('title', 'N/A')}\n")
+            buf.write(f"   Year: {bib.get('pub_year', 'N/A')}\n")
+            buf.write(f"   Citations: {pub.get('num_citations', 0)}\n")
+            buf.write(f"   Authors: {bib.get('author', 'N/A')}\n")
+
+    sys.stdout.write(buf.getvalue())
 
 def scholar_visualizer():
     """
@@ -113,12 +345,9 @@ def scholar_visualizer():
     # Specific paper citation ID from the URL
     target_citation_id = "u-x6o8ySG0sC"  # Updated citation ID for the new paper
 
-    # Search for author
-    author = scholarly.search_author_id(my_author_id)
+    # Search for author and fill publications (cached on disk)
+    author = cached_author_with_publications(my_author_id)
 
-    # Fill author details
-    scholarly.fill(author, sections=['publications'])
-    
     # Print formatted author details
     print_author_details(author)
 
@@ -134,19 +363,18 @@ def scholar_visualizer():
         print(f"Could not find publication with citation ID: {target_citation_id}")
         return
     
+    target_bib = target_publication.get('bib') or {}
     print(f"\n" + "="*50)
     print("TARGET PUBLICATION FOUND")
     print("="*50)
-    print(f"Title: {target_publication.get('bib', {}).get('title', 'N/A')}")
-    print(f"Year: {target_publication.get('bib', {}).get('pub_year', 'N/A')}")
+    print(f"Title: {target_bib.get('title', 'N/A')}")
+    print(f"Year: {target_bib.get('pub_year', 'N/A')}")
     print(f"Citations: {target_publication.get('num_citations', 0)}")
-    print(f"Authors: {target_publication.get('bib', {}).get('author', 'N/A')}")
+    print(f"Authors: {target_bib.get('author', 'N/A')}")
 
     # Get citations for this specific publication only
-    all_citations = []
     try:
-        citations = scholarly.citedby(target_publication)
-        all_citations.extend(citations)
+        all_citations = cached_citedby(target_publication)
         print(f"\nSuccessfully retrieved {len(all_citations)} citations for this paper")
     except KeyError:
         print(f"KeyError encountered for publication: {target_publication}. Skipping.")
@@ -154,19 +382,23 @@ def scholar_visualizer():
 
     print(f"Total citations for this paper: {len(all_citations)}")
 
-    # Process cited authors
-    cited_authors = []
+    # Collect unique author IDs first, then fetch them in parallel — each
+    # lookup is an independent HTTP request, so threads overlap the waits.
+    # dict.fromkeys dedupes in O(1) per ID while keeping citation order.
     for c in all_citations:
         print(f"Processing citation: {c['bib']['title']}")
-        try:
-            for a_id in c['author_id']:
-                if a_id:
-                    a = scholarly.search_author_id(a_id)
-                    if a:
-                        cited_authors.append(a)
-                        print(f"\t{a['name']}|{a['affiliation']}")
-        except KeyError:
-            print(f"KeyError encountered for citation: {c}. Skipping.")
+    unique_author_ids = list(dict.fromkeys(
+        a_id for c in all_citations for a_id in c.get('author_id', []) if a_id
+    ))
+
+    authors_by_id = fetch_authors_parallel(unique_author_ids)
+
+    cited_authors = []
+    for a_id in unique_author_ids:
+        a = authors_by_id.get(a_id)
+        if a:
+            cited_authors.append(a)
+            print(f"\t{a['name']}|{a['affiliation']}")
 
     # Get unique affiliations
     affiliations = set()
@@ -175,28 +407,24 @@ def scholar_visualizer():
             affiliations.add(a['affiliation'])
 
     # Print affiliations
-    print("\n" + "="*50)
-    print("AFFILIATIONS FOUND")
-    print("="*50)
-    for aff in affiliations:
-        print(aff)
+    sys.stdout.write(
+        "\n" + "="*50 + "\nAFFILIATIONS FOUND\n" + "="*50 + "\n"
+        + "\n".join(affiliations) + "\n"
+    )
 
     # Analyze citations with missing author info
     empty_author_citations = []
     authors_with_no_ids = {}  # title -> authors
     for c in all_citations:
-        non_empty_count = 0
-        no_ids = []
-        for i, a_id in enumerate(c['author_id']):
-            if a_id:
-                non_empty_count += 1
-            else:
-                no_ids.append(c['bib']['author'][i])
+        aids = c['author_id']
+        bib = c['bib']
+        no_ids = [name for a_id, name in zip(aids, bib['author']) if not a_id]
+        non_empty_count = len(aids) - len(no_ids)
         if no_ids:
-            authors_with_no_ids[c['bib']['title']] = no_ids
+            authors_with_no_ids[bib['title']] = no_ids
         if non_empty_count == 0:
             empty_author_citations.append(c)
-            print(f"Empty author info for citation: {c['bib']['title']}")
+            print(f"Empty author info for citation: {bib['title']}")
 
     print(f"Citations with empty author info: {len(empty_author_citations)}")
     for k, v in authors_with_no_ids.items():
@@ -204,7 +432,6 @@ def scholar_visualizer():
     print(f"Authors with no ids: {len(authors_with_no_ids)}")
 
     # Geocode locations and create map
-    geolocator = get_geocoder()
     latitudes = []
     longitudes = []
     location_names = []
@@ -214,24 +441,11 @@ def scholar_visualizer():
     print("GEOCODING RESULTS")
     print("="*50)
 
-    for affiliation in affiliations:
-        # First try to find a direct mapping
-        cleaned_aff = clean_affiliation(affiliation)
-        location_to_geocode = None
-        
-        # Check if any of the mapped institutions are in the affiliation
-        for institution, location in LOCATION_MAPPINGS.items():
-            if institution.lower() in cleaned_aff.lower():
-                location_to_geocode = location
-                print(f"Using mapped location for {institution}: {location}")
-                break
-        
-        # If no mapping found, use the cleaned affiliation
-        if not location_to_geocode:
-            location_to_geocode = cleaned_aff
+    # One async batch resolves everything that isn't mapped or cached;
+    # the AsyncRateLimiter inside keeps the request cadence polite
+    resolved = resolve_affiliations(affiliations)
 
-        lat, lon, address = geocode_location(geolocator, location_to_geocode)
-        
+    for affiliation, (lat, lon, address) in resolved.items():
         if lat is not None and lon is not None:
             latitudes.append(lat)
             longitudes.append(lon)
@@ -239,32 +453,13 @@ def scholar_visualizer():
             addresses.append(address)
             print(f"✓ Successfully geocoded: {affiliation} -> {address}")
         else:
-            print(f"✗ Could not geocode: {affiliation} -> {location_to_geocode}")
+            print(f"✗ Could not geocode: {affiliation}")
 
     if latitudes and longitudes:
         # Create and save the map
-        fig = go.Figure(data=go.Scattergeo(
-            lon=longitudes,
-            lat=latitudes,
-            text=location_names,
-            mode='markers',
-            marker_color="blue"
-        ))
-        
-        fig.update_geos(
-            visible=True,
-            scope="world",
-            showcountries=True,
-            countrycolor="Grey"
-        )
-        
-        fig.update_layout(
-            title=f'Citations Map for: {target_publication.get("bib", {}).get("title", "Target Paper")}',
-            geo_scope='world',
-        )
-        
-        # Save the figure
-        fig.write_image("citations_map_single_paper.png", scale=2)
+        title = f'Citations Map for: {target_bib.get("title", "Target Paper")}'
+        render_map(latitudes, longitudes, location_names, title,
+                   "citations_map_single_paper.png")
         print("\nMap saved as citations_map_single_paper.png")
         print(f"Total locations mapped: {len(latitudes)}")
         
@@ -288,29 +483,41 @@ def print_citation_tree(target_publication, all_citations, cited_authors):
     Print a hierarchical tree structure showing the paper, citing papers, and affiliations.
     Better organized to match authors with their specific citing papers.
     """
-    print("\n" + "="*80)
-    print("CITATION TREE")
-    print("="*80)
-    
+    # Render into one buffer and write it in a single syscall — per-line
+    # print() locking/flushing adds up on large trees, and the output
+    # stays atomic if anything else is printing concurrently
+    buf = io.StringIO()
+    buf.write("\n" + "="*80 + "\n")
+    buf.write("CITATION TREE\n")
+    buf.write("="*80 + "\n")
+
     # Main paper
-    target_title = target_publication.get('bib', {}).get('title', 'Target Paper')
-    print(f"📄 {target_title}")
+    target_title = (target_publication.get('bib') or {}).get('title', 'Target Paper')
+    buf.write(f"📄 {target_title}\n")
     
-    # Create a mapping of author names to affiliations from our cited_authors
+    # Create a mapping of author names to affiliations from our cited_authors,
+    # normalized once so per-author lookups don't re-lowercase every key.
+    # A token index narrows the fuzzy substring check to names that share
+    # at least one word with the target author.
     author_affiliation_map = {}
+    name_tokens = {}
     for author in cited_authors:
         if 'name' in author and 'affiliation' in author:
-            author_affiliation_map[author['name']] = author['affiliation']
+            lowered = author['name'].lower()
+            author_affiliation_map[lowered] = author['affiliation']
+            for token in lowered.split():
+                name_tokens.setdefault(token, []).append(lowered)
     
     # Process each citation and its authors
     for i, citation in enumerate(all_citations, 1):
-        citation_title = citation['bib']['title']
-        print(f"│")
+        bib = citation.get('bib') or {}
+        citation_title = bib['title']
+        buf.write("│\n")
         if i == len(all_citations):  # Last citation
-            print(f"└── 📝 {citation_title}")
+            buf.write(f"└── 📝 {citation_title}\n")
             connector = "    "
         else:
-            print(f"├── 📝 {citation_title}")
+            buf.write(f"├── 📝 {citation_title}\n")
             connector = "│   "
         
         # Get authors from the citation
@@ -318,8 +525,8 @@ def print_citation_tree(target_publication, all_citations, cited_authors):
         authors = []
         
         # Try to get author names from the bib data
-        if 'author' in citation.get('bib', {}):
-            bib_authors = citation['bib']['author']
+        if 'author' in bib:
+            bib_authors = bib['author']
             if isinstance(bib_authors, str):
                 # Single author or comma-separated string
                 if ',' in bib_authors and ' and ' not in bib_authors:
@@ -337,15 +544,19 @@ def print_citation_tree(target_publication, all_citations, cited_authors):
                 # Clean up author name (remove extra spaces, etc.)
                 clean_author = author_name.strip()
                 
-                # Check if we have affiliation info for this author
-                affiliation_found = None
-                for known_name, affiliation in author_affiliation_map.items():
-                    # Try different matching strategies
-                    if (clean_author.lower() == known_name.lower() or 
-                        clean_author.lower() in known_name.lower() or
-                        known_name.lower() in clean_author.lower()):
-                        affiliation_found = affiliation
-                        break
+                # Check if we have affiliation info for this author:
+                # O(1) exact hit first, then substring matching against
+                # only the names sharing a token
+                author_lower = clean_author.lower()
+                affiliation_found = author_affiliation_map.get(author_lower)
+                if affiliation_found is None:
+                    candidates = set()
+                    for token in author_lower.split():
+                        candidates.update(name_tokens.get(token, ()))
+                    for known_name in candidates:
+                        if author_lower in known_name or known_name in author_lower:
+                            affiliation_found = author_affiliation_map[known_name]
+                            break
                 
                 # Format the output
                 if is_last_author:
@@ -354,9 +565,9 @@ def print_citation_tree(target_publication, all_citations, cited_authors):
                     branch = "├──"
                 
                 if affiliation_found:
-                    print(f"{connector}{branch} 🏛️  {clean_author} → {affiliation_found}")
+                    buf.write(f"{connector}{branch} 🏛️  {clean_author} → {affiliation_found}\n")
                 else:
-                    print(f"{connector}{branch} 👤 {clean_author} (No institutional information)")
+                    buf.write(f"{connector}{branch} 👤 {clean_author} (No institutional information)\n")
                 
                 citation_has_authors = True
         
@@ -367,15 +578,16 @@ def print_citation_tree(target_publication, all_citations, cited_authors):
             for author in cited_authors:
                 if 'name' in author:
                     # This is a very basic heuristic - in reality, this would need more sophisticated matching
-                    print(f"{connector}└── ❓ No author information available")
+                    buf.write(f"{connector}└── ❓ No author information available\n")
                     found_match = True
                     break
-            
+
             if not found_match:
-                print(f"{connector}└── ❓ No author information available")
-    
-    print(f"│")
-    print("└── End of citations")
+                buf.write(f"{connector}└── ❓ No author information available\n")
+
+    buf.write("│\n")
+    buf.write("└── End of citations\n")
+    sys.stdout.write(buf.getvalue())
 
 if __name__ == "__main__":
     scholar_visualizer()
\ No newline at end of file